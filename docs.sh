@@ -3,6 +3,9 @@
 cat > README.md << 'EOF'
 # Isikukood
 
+![GitHub](https://img.shields.io/github/license/ui-1/isikukood)
+![PyPI](https://img.shields.io/pypi/v/isikukood)
+
 Small Estonian social security number library (I know they're not really SSNs but I don't have a better English name for them)
 
 # Installation
@@ -14,5 +17,5 @@ pip install isikukood
 
 EOF
 
-pydoc-markdown -I isikukood/ -m functions -m isikukood -m assertions --render-toc >> README.md
+pydoc-markdown -I isikukood/ -m functions -m isikukood -m assertions -m errors --render-toc >> README.md
 sed -i 's/<a/---\n<a/' README.md
@@ -1,4 +1,5 @@
 from isikukood.isikukood import Isikukood
+from isikukood.errors import ValidationError
 from isikukood.assertions import (
     assert_constructor_list,
     assert_correct_checksum,
@@ -6,8 +7,10 @@ from isikukood.assertions import (
     assert_first_digit,
     assert_gender,
     assert_numeric,
+    assert_ordernumber_list,
     assert_ordernumber_range,
     assert_valid_ssn,
+    assert_valid_ssns,
     assert_year_range,
 )
 from isikukood.functions import (
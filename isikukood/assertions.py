@@ -1,73 +1,92 @@
-import datetime
-from typing import List
+import os
+from typing import List, Sequence
 
 import isikukood.functions
 import isikukood.errors
 
+# Whether SSN constructors should fully re-validate everything they generate (see assert_constructor_list()).
+# Generated SSNs are valid by construction, so by default only the cheap duplicate check is done.
+# Set the ISIKUKOOD_SANITY environment variable to 1 to turn the full check on.
+_VALIDATE_CONSTRUCTED = os.environ.get('ISIKUKOOD_SANITY') == '1'
+
+# Number of days in each month on a non-leap year, indexed by month number
+_MDAYS = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
 
 def assert_ordernumber_range(ordernumber: int) -> None:
     """Assert that the given argument is between 0 and 999 (inclusive).
 
     Raises:
-        AssertionError: When the assertion fails.
+        ValidationError: When the assertion fails.
     """
 
-    try:
-        assert ordernumber in range(0, 999 + 1)
-    except AssertionError:
-        raise AssertionError(f'Order number was {ordernumber}, expected a value between 0 and 999 (incl.)')
+    if not isinstance(ordernumber, int):
+        raise isikukood.errors.ValidationError(f'Expected order number to be an integer - got {ordernumber!r} instead.')
+    if not 0 <= ordernumber <= 999:
+        raise isikukood.errors.ValidationError(f'Order number was {ordernumber}, expected a value between 0 and 999 (incl.)')
+
+
+def assert_ordernumber_list(ordernumbers: Sequence[int]) -> None:
+    """Assert that every element of the given argument is an integer between 0 and 999 (inclusive).
+
+    Raises:
+        ValidationError: When the assertion fails.
+    """
+
+    # min() and max() only say something about the whole list once every element is known to be an integer
+    for ordernumber in ordernumbers:
+        if not isinstance(ordernumber, int):
+            raise isikukood.errors.ValidationError(f'Expected order numbers to be integers - got {ordernumber!r} instead.')
+
+    if ordernumbers:
+        assert_ordernumber_range(min(ordernumbers))
+        assert_ordernumber_range(max(ordernumbers))
 
 
 def assert_numeric(arg: str) -> None:
-    """Assert that the given argument is numeric.
+    """Assert that the given argument consists of ASCII digits only.
 
     Raises:
-        AssertionError: When the assertion fails.
+        ValidationError: When the assertion fails.
     """
 
-    try:
-        assert arg.isnumeric()
-    except AssertionError:
-        raise AssertionError(f'Given argument ({arg}) is not numeric')
+    if not (arg.isascii() and arg.isdigit()):
+        raise isikukood.errors.ValidationError(f'Given argument ({arg}) is not numeric')
 
 
 def assert_gender(gender: str) -> None:
     """Assert that the given argument is either 'm' or 'f'.
 
     Raises:
-        AssertionError: When the assertion fails.
+        ValidationError: When the assertion fails.
     """
 
-    try:
-        assert gender in ['m', 'f']
-    except AssertionError:
-        raise AssertionError(f'Expected gender to be either m or f - got {gender} instead.')
+    if gender not in ('m', 'f'):
+        raise isikukood.errors.ValidationError(f'Expected gender to be either m or f - got {gender} instead.')
 
 
 def assert_first_digit(ssn: str) -> None:
     """Assert that the first character of the given argument is between 1 and 8 (inclusive).
 
     Raises:
-        AssertionError: When the assertion fails.
+        ValidationError: When the assertion fails.
     """
 
-    try:
-        assert int(ssn[0]) in range(1, 8+1)
-    except AssertionError:
-        raise AssertionError(f'Given SSN ({ssn}) begins with a {ssn[0]}, expected a value between 1 and 8 (incl.)')
+    if not '1' <= ssn[0] <= '8':
+        raise isikukood.errors.ValidationError(f'Given SSN ({ssn}) begins with a {ssn[0]}, expected a value between 1 and 8 (incl.)')
 
 
 def assert_year_range(yyyy: int) -> None:
     """Assert that the given argument is between 1800 and 2199 (inclusive).
 
     Raises:
-        AssertionError: When the assertion fails.
+        ValidationError: When the assertion fails.
     """
 
-    try:
-        assert yyyy in range(1800, 2199 + 1)
-    except AssertionError:
-        raise AssertionError(f'Expected year to be between 1800 and 2199 (incl.) - got {yyyy} instead.')
+    if not isinstance(yyyy, int):
+        raise isikukood.errors.ValidationError(f'Expected year to be an integer - got {yyyy!r} instead.')
+    if not 1800 <= yyyy <= 2199:
+        raise isikukood.errors.ValidationError(f'Expected year to be between 1800 and 2199 (incl.) - got {yyyy} instead.')
 
 
 def assert_existing_date(date: str) -> None:
@@ -77,34 +96,54 @@ def assert_existing_date(date: str) -> None:
         date (str): Date in ISO 8601 (YYYY-MM-DD).
 
     Raises:
-        AssertionError: When the assertion fails.
+        ValidationError: When the assertion fails.
     """
 
-    try:
-        datetime.date.fromisoformat(date)
-    except ValueError:
-        raise AssertionError(f'Date {date} is invalid')
+    if len(date) != 10 or date[4] != '-' or date[7] != '-':
+        raise isikukood.errors.ValidationError(f'Date {date} is invalid')
 
+    digits = date[:4] + date[5:7] + date[8:10]
+    if not (digits.isascii() and digits.isdigit()):
+        raise isikukood.errors.ValidationError(f'Date {date} is invalid')
 
-def assert_constructor_list(ssns: List[str]) -> None:
+    yyyy, mm, dd = int(digits[:4]), int(digits[4:6]), int(digits[6:])
+    if yyyy < 1 or not 1 <= mm <= 12 or not 1 <= dd <= _days_in_month(yyyy, mm):
+        raise isikukood.errors.ValidationError(f'Date {date} is invalid')
+
+
+def _days_in_month(yyyy: int, mm: int) -> int:
+    """Return the number of days in the given month, taking leap years into account."""
+
+    if mm == 2 and yyyy % 4 == 0 and (yyyy % 100 != 0 or yyyy % 400 == 0): return 29
+    return _MDAYS[mm]
+
+
+def assert_constructor_list(ssns: List[str], validate: bool = True) -> None:
     """Sanity check called by SSN constructors.
     Asserts that the given argument contains no duplicates and that every one of its elements is a valid Estonian SSN.
 
     Args:
         ssns (List[str]): List of SSNs coming from Isikukood.construct().
+        validate (bool): Whether to validate every SSN individually. If False, only the duplicate check is done.
+            Defaults to True.
 
     Raises:
         AssertionError: When any of the assertions fail.
     """
 
-    try:
-        # Ensure that there are no duplicates
-        assert len(ssns) == len(set(ssns))
-
+    # Ensure that there are no duplicates. Only look for the offending SSN if there is one,
+    # since building the set in one go is much faster than checking the SSNs one by one.
+    if len(ssns) != len(set(ssns)):
+        seen = set()
         for ssn in ssns:
-            isikukood.assertions.assert_valid_ssn(ssn)
-    except AssertionError as e:
-        raise AssertionError(isikukood.errors.BUG_MSG + str(e))
+            if ssn in seen: raise AssertionError(isikukood.errors.BUG_MSG + f'Found duplicate SSN {ssn}')
+            seen.add(ssn)
+
+    if validate:
+        try:
+            isikukood.assertions.assert_valid_ssns(ssns)
+        except AssertionError as e:
+            raise AssertionError(isikukood.errors.BUG_MSG + str(e))
 
 
 def assert_valid_ssn(ssn: str) -> None:
@@ -117,41 +156,68 @@ def assert_valid_ssn(ssn: str) -> None:
      * that the year of birth is between 1800 and 2199 (inclusive)
 
     Raises:
-        AssertionError: When any of the assertions fail.
+        ValidationError: When any of the assertions fail.
     """
 
-    assert_numeric(ssn)
-    assert_first_digit(ssn)
+    _assert_valid_ssn_digits(ssn)
 
-    try:
-        assert len(ssn) == 11
-    except AssertionError:
-        raise AssertionError(f'Given SSN ({ssn}) is {len(ssn)} digits, expected 11')
+    # The first digit has already been checked above and the date is checked below
+    birthdate = isikukood.functions._birthdate_from_ssn_unchecked(ssn)
+
+    assert_year_range(int(birthdate[:4]))
+    assert_existing_date(birthdate)
+
+
+def _assert_valid_ssn_digits(ssn: str) -> None:
+    """Perform all of assert_valid_ssn()'s checks except for the ones on the birthdate."""
+
+    if not (len(ssn) == 11 and ssn.isascii() and ssn.isdigit() and '1' <= ssn[0] <= '8'):
+        # Let the individual checks raise the appropriate error
+        assert_numeric(ssn)
+        assert_first_digit(ssn)
+
+        if len(ssn) != 11:
+            raise isikukood.errors.ValidationError(f'Given SSN ({ssn}) is {len(ssn)} digits, expected 11')
 
     assert_correct_checksum(ssn)
 
-    try: birthdate = isikukood.functions.birthdate_from_ssn(ssn)
-    except ValueError as e: raise AssertionError(e)
 
-    assert_year_range(int(birthdate[:4]))
-    assert_existing_date(birthdate)
+def assert_valid_ssns(ssns: Sequence[str]) -> None:
+    """Assert that every element of the given list is a valid Estonian SSN.
+    Performs the same checks as assert_valid_ssn(), but checksums the whole list at once and skips the per-check
+    function calls for SSNs that turn out to be valid, which makes it considerably faster for long lists.
+
+    Raises:
+        ValidationError: When any of the assertions fail.
+    """
+
+    for ssn in ssns:
+        if not (len(ssn) == 11 and ssn.isascii() and ssn.isdigit() and '1' <= ssn[0] <= '8'):
+            # Let the regular checks raise the appropriate error
+            assert_valid_ssn(ssn)
+
+    for ssn, checksum in zip(ssns, isikukood.functions._checksum_batch(ssns)):
+        yyyy = int(isikukood.functions._CENTURY[ssn[0]] + ssn[1:3])
+        mm, dd = int(ssn[3:5]), int(ssn[5:7])
+
+        if checksum != ord(ssn[10]) - 48 or not 1 <= mm <= 12 or not 1 <= dd <= _days_in_month(yyyy, mm):
+            assert_valid_ssn(ssn)
 
 
 def assert_correct_checksum(ssn: str) -> None:
     """Assert that the given SSN's checksum is correct.
 
     Raises:
-        AssertionError: When the assertion fails.
+        ValidationError: When the assertion fails.
     """
 
     expected_checksum = isikukood.functions.calculate_checksum(ssn)
-    try:
-        assert str(expected_checksum) == ssn[10]
-    except AssertionError:
-        raise AssertionError(f'Invalid checksum for {ssn} - expected {expected_checksum}')
+    if str(expected_checksum) != ssn[10]:
+        raise isikukood.errors.ValidationError(f'Invalid checksum for {ssn} - expected {expected_checksum}')
 
 
-def assert_enum_arguments(genders: List[str], days: List[int], months: List[int], years: List[int]) -> None:
+def assert_enum_arguments(genders: Sequence[str], days: Sequence[int], months: Sequence[int],
+                          years: Sequence[int]) -> None:
     """Assert that the arguments for functions.enum() are valid. This performs the following checks:
      * that every element in genders is either 'm' or 'f'
      * that every element in days is between 1 and 31 (inclusive)
@@ -159,24 +225,23 @@ def assert_enum_arguments(genders: List[str], days: List[int], months: List[int]
      * that every element in years is between 1800 and 2199 (inclusive)
 
      Raises:
-         AssertionError: When any of the assertions fail.
+         ValidationError: When any of the assertions fail.
     """
-    try:
-        for g in genders: assert g == 'm' or g == 'f'
-    except AssertionError:
-        raise AssertionError(f'Genders must contain \'m\', \'f\', or both. Got {genders} instead.')
+    for g in genders:
+        if g != 'm' and g != 'f':
+            raise isikukood.errors.ValidationError(f'Genders must contain \'m\', \'f\', or both. Got {genders} instead.')
 
     for d in days:
-        try:
-            assert d in range(1, 31 + 1)
-        except AssertionError:
-            raise AssertionError(f'Days must only contain values between 1 and 31 (incl.), found unexpected value {d}')
+        if not isinstance(d, int):
+            raise isikukood.errors.ValidationError(f'Days must only contain integers, found unexpected value {d!r}')
+        if not 1 <= d <= 31:
+            raise isikukood.errors.ValidationError(f'Days must only contain values between 1 and 31 (incl.), found unexpected value {d}')
 
     for m in months:
-        try:
-            assert m in range(1, 12 + 1)
-        except AssertionError:
-            raise AssertionError(f'Months must only contain values between 1 and 12 (incl.), found unexpected value {m}')
+        if not isinstance(m, int):
+            raise isikukood.errors.ValidationError(f'Months must only contain integers, found unexpected value {m!r}')
+        if not 1 <= m <= 12:
+            raise isikukood.errors.ValidationError(f'Months must only contain values between 1 and 12 (incl.), found unexpected value {m}')
 
     for y in years:
         isikukood.assertions.assert_year_range(y)
@@ -1,2 +1,8 @@
 BUG_MSG = '\n\n\nSanity check failed - this is probably a bug in the module. Please report it, thanks!' \
           '\nThe original exception was: '
+
+
+class ValidationError(ValueError, AssertionError):
+    """Raised by the functions in isikukood.assertions when a check fails.
+    Subclasses ValueError, as well as AssertionError for backwards compatibility.
+    """
@@ -1,9 +1,29 @@
 import datetime
-from typing import List
+import functools
+import itertools
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 import isikukood.assertions
-import isikukood.errors
-import isikukood.isikukood
+
+# Genders, indexed by the parity of the gender marker
+_GENDER = ('f', 'm')
+
+# Gender markers, keyed by gender and century
+_GM = {('m', 18): '1', ('f', 18): '2', ('m', 19): '3', ('f', 19): '4',
+       ('m', 20): '5', ('f', 20): '6', ('m', 21): '7', ('f', 21): '8'}
+
+# First two digits of the year of birth, keyed by gender marker
+_CENTURY = {'1': '18', '2': '18', '3': '19', '4': '19', '5': '20', '6': '20', '7': '21', '8': '21'}
+
+# Zero-padded order numbers, indexed by the order number itself
+_ONUM_STR = tuple(f'{i:03}' for i in range(999 + 1))
+
+# Contributions of the order number's digits to both weighted sums of the checksum (see _checksum_from_bytes()),
+# indexed by the order number itself
+_ONUM_K1 = tuple(8 * (i // 100) + 9 * (i // 10 % 10) + i % 10 for i in range(999 + 1))
+_ONUM_K2 = tuple(i // 100 + 2 * (i // 10 % 10) + 3 * (i % 10) for i in range(999 + 1))
+
+_DIGITS = ('0', '1', '2', '3', '4', '5', '6', '7', '8', '9')
 
 
 def ordernumber_from_ssn(ssn: str) -> int:
@@ -36,10 +56,11 @@ def gender_from_ssn(ssn: str) -> str:
         str: Either 'm' or 'f'.
     """
 
-    if int(ssn[0]) % 2 == 0: return 'f'
-    else: return 'm'
+    return _GENDER[ord(ssn[0]) & 1]
 
 
+# typed=True, so that e.g. 2000.0 doesn't get the cached result for 2000
+@functools.lru_cache(maxsize=1024, typed=True)
 def gender_marker(yyyy: int, gender: str) -> str:
     """Find the suitable gender marker (first digit), given gender and year of birth.
 
@@ -62,23 +83,20 @@ def gender_marker(yyyy: int, gender: str) -> str:
         ValueError: When either one of the arguments is invalid.
     """
 
-    try:
+    # The type has to be checked separately, since e.g. a float year would also be found in the table
+    if not isinstance(yyyy, int) or (gender, yyyy // 100) not in _GM:
+        # Let the assertions raise the appropriate error
         isikukood.assertions.assert_year_range(yyyy)
         isikukood.assertions.assert_gender(gender)
-    except AssertionError as e: raise ValueError(e)
-
-    if yyyy in range(1800, 1899 + 1):
-        if gender == 'm': return '1'
-        if gender == 'f': return '2'
-    if yyyy in range(1900, 1999 + 1):
-        if gender == 'm': return '3'
-        if gender == 'f': return '4'
-    if yyyy in range(2000, 2099 + 1):
-        if gender == 'm': return '5'
-        if gender == 'f': return '6'
-    if yyyy in range(2100, 2199 + 1):
-        if gender == 'm': return '7'
-        if gender == 'f': return '8'
+
+    return _GM[(gender, yyyy // 100)]
+
+
+@functools.lru_cache(maxsize=1024)
+def _prefix(gender: str, birthdate: str) -> str:
+    """Build the first 7 digits of an SSN (gender marker and YYMMDD), given an already validated gender and birthdate."""
+
+    return gender_marker(int(birthdate[:4]), gender) + birthdate[2:4] + birthdate[5:7] + birthdate[8:10]
 
 
 def birthdate_from_ssn(ssn: str) -> str:
@@ -97,24 +115,24 @@ def birthdate_from_ssn(ssn: str) -> str:
         str: Corresponding birthdate in ISO 8601 (yyyy-mm-dd).
     """
 
-    try: isikukood.assertions.assert_first_digit(ssn)
-    except AssertionError as e: raise ValueError(e)
+    isikukood.assertions.assert_first_digit(ssn)
 
-    if ssn[0] in ['1', '2']: yy1 = '18'
-    if ssn[0] in ['3', '4']: yy1 = '19'
-    if ssn[0] in ['5', '6']: yy1 = '20'
-    if ssn[0] in ['7', '8']: yy1 = '21'
+    birthdate = _birthdate_from_ssn_unchecked(ssn)
 
-    yy2 = ssn[1:2 + 1]
-    mm = ssn[3:4 + 1]
-    dd = ssn[5:6 + 1]
+    isikukood.assertions.assert_existing_date(birthdate)
 
-    birthdate = f'{yy1}{yy2}-{mm}-{dd}'
+    return birthdate
 
-    try: isikukood.assertions.assert_existing_date(birthdate)
-    except AssertionError as e: raise ValueError(e)
 
-    return birthdate
+def _birthdate_from_ssn_unchecked(ssn: str) -> str:
+    """Same as birthdate_from_ssn(), but assumes that the first digit is already known to be valid
+    and does not check whether the resulting date exists.
+    """
+
+    yy1 = _CENTURY[ssn[0]]
+    yy2, mm, dd = ssn[1:3], ssn[3:5], ssn[5:7]
+
+    return ''.join((yy1, yy2, '-', mm, '-', dd))
 
 
 def insert_checksum(ssn: str) -> str:
@@ -135,16 +153,14 @@ def insert_checksum(ssn: str) -> str:
         ValueError: When the given SSN is not 10 or 11 digits in length.
     """
 
-    try:
-        assert len(ssn) in [10, 11]
-    except AssertionError:
+    if len(ssn) not in (10, 11):
         raise ValueError(f'Given SSN ({ssn}) is {len(ssn)} digits, expected 10 or 11')
 
     ssn = ssn[0:10]
     return ssn + str(calculate_checksum(ssn))
 
 
-def calculate_checksum(ssn: str) -> int:
+def calculate_checksum(ssn: str, validate: bool = True) -> int:
     """Calculate the given SSN's checksum as per https://et.wikipedia.org/wiki/Isikukood#Kontrollnumber
 
     Examples:
@@ -155,39 +171,83 @@ def calculate_checksum(ssn: str) -> int:
 
     Args:
         ssn (str): Estonian SSN. May or may not already contain the checksum digit (can be either 10 or 11 digits).
+        validate (bool): Whether to check that the SSN is numeric and of correct length. Defaults to True.
 
     Returns:
         int: Corresponding checksum.
     """
 
-    try: isikukood.assertions.assert_numeric(ssn)
-    except AssertionError as e: raise ValueError(e)
+    if validate:
+        isikukood.assertions.assert_numeric(ssn)
 
-    try: assert len(ssn) in [10, 11]
-    except AssertionError: raise ValueError(f'Given SSN ({ssn}) is {len(ssn)} digits, expected 10 or 11')
+        if len(ssn) not in (10, 11):
+            raise ValueError(f'Given SSN ({ssn}) is {len(ssn)} digits, expected 10 or 11')
 
-    k = 0
+    return _checksum_from_bytes(ssn.encode('ascii'))
 
-    for i in range(1, 9 + 1):
-        k += int(ssn[i-1]) * i
-    k += int(ssn[9])
 
-    j = k % 11
-    if j < 10: return j
+def _checksum_from_bytes(ssn: bytes) -> int:
+    """Calculate the checksum of an SSN given as ASCII bytes, without any validation. Only the first 10 digits are used."""
 
-    k = 0
-    for i in range(3, 9 + 1):
-        k += int(ssn[i-3]) * i
-    for i in range(1, 3 + 1):
-        k += int(ssn[i+6]) * i
+    d0, d1, d2, d3, d4, d5, d6, d7, d8, d9 = ssn[:10]
 
-    j = k % 11
+    # The digits are still ASCII codes, so instead of subtracting 48 from each one,
+    # 48 times the sum of the weights is subtracted from the weighted sum
+    j = (d0 + 2*d1 + 3*d2 + 4*d3 + 5*d4 + 6*d5 + 7*d6 + 8*d7 + 9*d8 + d9 - 48*46) % 11
     if j < 10: return j
-    else: return 0
 
+    # A remainder of 10 means a checksum of 0, which is exactly what % 10 gives
+    return (3*d0 + 4*d1 + 5*d2 + 6*d3 + 7*d4 + 8*d5 + 9*d6 + d7 + 2*d8 + 3*d9 - 48*48) % 11 % 10
+
+
+def _prefix_sums(prefix: str) -> Tuple[int, int]:
+    """Compute the 7-digit prefix's part of both weighted sums of the checksum (see _checksum_from_bytes())."""
+
+    d0, d1, d2, d3, d4, d5, d6 = prefix.encode('ascii')
+    return (d0 + 2*d1 + 3*d2 + 4*d3 + 5*d4 + 6*d5 + 7*d6 - 48*28,
+            3*d0 + 4*d1 + 5*d2 + 6*d3 + 7*d4 + 8*d5 + 9*d6 - 48*42)
 
-def enum(genders: List[str]=None, days: List[int]=None, months: List[int]=None, years: List[int]=None,
-         onums: List[int]=None) -> List[str]:
+
+def _gen_ssns(prefix: str, prefix_sums: Tuple[int, int], onums: Iterable[int]) -> List[str]:
+    """Generate the SSNs with the given 7-digit prefix and order numbers, without any validation.
+    Only the order numbers' precomputed parts of the checksum are added to the prefix's (see _prefix_sums()) per SSN.
+    """
+
+    k1, k2 = prefix_sums
+
+    ret = []
+    for onum in onums:
+        j = (k1 + _ONUM_K1[onum]) % 11
+        if j == 10: j = (k2 + _ONUM_K2[onum]) % 11 % 10
+        ret.append(prefix + _ONUM_STR[onum] + _DIGITS[j])
+
+    return ret
+
+
+@functools.lru_cache(maxsize=128)
+def _all_ssns(prefix: str) -> Tuple[str, ...]:
+    """Generate (and sanity check) all 1000 SSNs with the given 7-digit prefix.
+    The result is cached, since the same birthdate tends to get constructed repeatedly. One entry takes up about 70KB.
+    """
+
+    ret = _gen_ssns(prefix, _prefix_sums(prefix), range(999 + 1))
+
+    isikukood.assertions.assert_constructor_list(ret, isikukood.assertions._VALIDATE_CONSTRUCTED)
+
+    return tuple(ret)
+
+
+def _checksum_batch(ssns: Sequence[str]) -> List[int]:
+    """Calculate the checksums of many SSNs at once. Each element may be either a full SSN or just its first 10 digits.
+    Same as calculate_checksum(ssn, validate=False) for every element.
+    """
+
+    return [_checksum_from_bytes(ssn.encode('ascii')) for ssn in ssns]
+
+
+def enum(genders: Optional[Sequence[str]]=None, days: Optional[Sequence[int]]=None,
+         months: Optional[Sequence[int]]=None, years: Optional[Sequence[int]]=None,
+         onums: Optional[Sequence[int]]=None) -> List[str]:
     """Generate all valid Estonian SSNs possible with the given arguments.
 
     Examples:
@@ -210,44 +270,33 @@ def enum(genders: List[str]=None, days: List[int]=None, months: List[int]=None,
         ValueError: When any of the given arguments is invalid.
     """
 
+    # The defaults contain no duplicates, so only arguments that were actually given need to be deduplicated
     if genders is None: genders = ['m', 'f']
-    if days is None: days = list(range(1, 31 + 1))
-    if months is None: months = list(range(1, 12 + 1))
+    else: genders = list(dict.fromkeys(g.lower() for g in genders))
+    if days is None: days = range(1, 31 + 1)
+    else: days = list(dict.fromkeys(days))
+    if months is None: months = range(1, 12 + 1)
+    else: months = list(dict.fromkeys(months))
     if years is None: years = [datetime.datetime.now().year]
-    if onums is None: onums = list(range(0, 999 + 1))
-
-    genders = [g.lower() for g in genders]
-    genders = list(set(genders))
-    days = list(set(days))
-    months = list(set(months))
-    years = list(set(years))
-    onums = list(set(onums))
-
-    try: isikukood.assertions.assert_enum_arguments(genders, days, months, years)
-    except AssertionError as e: raise ValueError(e)
-
-    for lis in [days, months, years]:
-        for i in range(len(lis)):
-            if int(lis[i]) < 10: lis[i] = '0' + str(lis[i])  # 2 -> 02
-            else: lis[i] = str(lis[i])
-
-    dates = []
-    for year in years:
-        for month in months:
-            for day in days:
-                dates.append(f'{year}-{month}-{day}')
-
-    dates_pruned = []
-    for date in dates:
-        try: isikukood.assertions.assert_existing_date(date)
-        except AssertionError: continue
-        dates_pruned.append(date)
+    else: years = list(dict.fromkeys(years))
+    if onums is None: onums = range(0, 999 + 1)
+    else: onums = list(dict.fromkeys(onums))
+
+    isikukood.assertions.assert_enum_arguments(genders, days, months, years)
+    isikukood.assertions.assert_ordernumber_list(onums)
+
+    # YYMMDD part of every existing date, along with its year
+    date_cores = [(yyyy, f'{yyyy % 100:02}{mm:02}{dd:02}')
+                  for yyyy, mm, dd in itertools.product(years, months, days)
+                  if dd <= isikukood.assertions._days_in_month(yyyy, mm)]
 
     ssns = []
     for gender in genders:
-        for date in dates_pruned:
-            ssns.extend(isikukood.Isikukood(gender, date).construct(onums))
+        gms = {yyyy: gender_marker(yyyy, gender) for yyyy in years}
+        for yyyy, core in date_cores:
+            prefix = gms[yyyy] + core
+            ssns.extend(_gen_ssns(prefix, _prefix_sums(prefix), onums))
     ssns.sort()
-    isikukood.assertions.assert_constructor_list(ssns)
+    isikukood.assertions.assert_constructor_list(ssns, isikukood.assertions._VALIDATE_CONSTRUCTED)
 
     return ssns
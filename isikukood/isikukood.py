@@ -1,17 +1,15 @@
-from multimethod import multimethod
-from typing import List
+from typing import List, Union, overload
 
 import isikukood.functions
 import isikukood.assertions
 
 
 class Isikukood:
-    def __init__(self, gender: str, birthdate: str):
-        self.gender = gender
-        self.birthdate = birthdate
+    def __init__(self, gender: str, birthdate: str) -> None:
+        self._set_identity(gender, birthdate)
 
     @classmethod
-    def from_ssn(cls, ssn: str):
+    def from_ssn(cls, ssn: str) -> 'Isikukood':
         """Instantiate the class from an already existing SSN.
 
         Examples:
@@ -23,121 +21,107 @@ class Isikukood:
             ValueError: When the given SSN is invalid.
         """
 
-        try: isikukood.assertions.assert_valid_ssn(ssn)
-        except AssertionError as e: raise ValueError(e)
+        # The birthdate setter checks the date, so only the rest of the SSN needs to be checked here
+        isikukood.assertions._assert_valid_ssn_digits(ssn)
 
         gender = isikukood.functions.gender_from_ssn(ssn)
 
-        return cls(gender, isikukood.functions.birthdate_from_ssn(ssn))
+        return cls(gender, isikukood.functions._birthdate_from_ssn_unchecked(ssn))
 
     @property
-    def gender(self):
+    def gender(self) -> str:
         return self._gender
 
     @gender.setter
-    def gender(self, new_gender: str):
-        new_gender = new_gender.lower()
-        try: isikukood.assertions.assert_gender(new_gender)
-        except AssertionError as e: raise ValueError(e)
-        self._gender = new_gender
+    def gender(self, new_gender: str) -> None:
+        self._set_identity(new_gender, self._birthdate)
 
     @property
-    def birthdate(self):
+    def birthdate(self) -> str:
         return self._birthdate
 
     @birthdate.setter
-    def birthdate(self, new_birthdate: str):
-        yyyy = int(new_birthdate[:4])
+    def birthdate(self, new_birthdate: str) -> None:
+        self._set_identity(self._gender, new_birthdate)
 
-        try:
-            isikukood.assertions.assert_year_range(yyyy)
-            isikukood.assertions.assert_existing_date(new_birthdate)
-        except AssertionError as e: raise ValueError(e)
+    def _set_identity(self, gender: str, birthdate: str) -> None:
+        # Validate both values before assigning anything, so that a failed update leaves the instance untouched
+        gender = gender.lower()
+        isikukood.assertions.assert_gender(gender)
 
-        self._birthdate = new_birthdate
+        # Checking that the date exists also checks its format, so the year can be safely parsed afterwards
+        isikukood.assertions.assert_existing_date(birthdate)
+        isikukood.assertions.assert_year_range(int(birthdate[:4]))
 
-    def _gen_ssn(self, ordernumber: int) -> str:
-        gm = isikukood.functions.gender_marker(int(self.birthdate[:4]), self.gender)
-        xxyy = str(self.birthdate[2:4])
-        mm = str(self.birthdate[5:7])
-        dd = str(self.birthdate[8:10])
-
-        base = gm + xxyy + mm + dd + "{0:03}".format(ordernumber)
-        return base + str(isikukood.functions.calculate_checksum(base))
-
-    @multimethod
-    def construct(self) -> List[str]:
-        """Generate all possible SSNs with the instance's gender and birthdate.
-
-        Examples:
-        ```python
-            >>>isikukood.Isikukood('m', '2000-01-01').construct()
-            ['50001010006', '50001010017', '50001010028', ...]
-        ```
+        self._gender = gender
+        self._birthdate = birthdate
 
+        # The first 7 digits and their part of the checksum are shared by all of the instance's SSNs
+        self._prefix = isikukood.functions._prefix(gender, birthdate)
+        self._prefix_sums = isikukood.functions._prefix_sums(self._prefix)
 
-        Returns:
-            List[str]: List of SSNs.
-        """
+    def _gen_ssn(self, ordernumber: int) -> str:
+        return isikukood.functions._gen_ssns(self._prefix, self._prefix_sums, (ordernumber,))[0]
 
-        ret = []
-        for i in range(999 + 1):
-            ret.append(self._gen_ssn(i))
+    @overload
+    def construct(self, ordernumbers: None = None) -> List[str]: ...
 
-        isikukood.assertions.assert_constructor_list(ret)
+    @overload
+    def construct(self, ordernumbers: int) -> str: ...
 
-        return ret
+    @overload
+    def construct(self, ordernumbers: List[int]) -> List[str]: ...
 
-    @multimethod
-    def construct(self, ordernumber: int) -> str:
-        """Generate an SSN with the instance's gender and birthdate and the order number that was given as an argument.
+    def construct(self, ordernumbers: Union[int, List[int], None] = None) -> Union[str, List[str]]:
+        """Generate SSNs with the instance's gender and birthdate.
+        Without arguments, all possible SSNs are generated. Given an order number, the SSN with that order number is
+        generated. Given a list of order numbers, an SSN is generated for every one of them.
 
         Examples:
         ```python
+            >>>isikukood.Isikukood('m', '2000-01-01').construct()
+            ['50001010006', '50001010017', '50001010028', ...]
             >>>isikukood.Isikukood('m', '2000-01-01').construct(111)
             '50001011112'
+            >>>isikukood.Isikukood('m', '2000-01-01').construct([111, 222, 333])
+            ['50001011112', '50001012229', '50001013335']
         ```
 
+        Args:
+            ordernumbers (Union[int, List[int]]): Order number or list of order numbers. Defaults to all of them.
+
+        Returns:
+            Union[str, List[str]]: A single SSN if a single order number was given, otherwise a list of SSNs.
+
         Raises:
-            ValueError: When the given order number is invalid.
+            ValueError: When any of the given order numbers is invalid.
+            TypeError: When the argument is neither an order number nor a list of order numbers.
         """
 
-        try: isikukood.assertions.assert_ordernumber_range(ordernumber)
-        except AssertionError as e: raise ValueError(e)
+        if ordernumbers is None: return self._construct_all()
+        if isinstance(ordernumbers, int): return self._construct_one(ordernumbers)
+        if isinstance(ordernumbers, list): return self._construct_many(ordernumbers)
 
-        ssn = self._gen_ssn(ordernumber)
+        raise TypeError(f'Expected an order number or a list of order numbers, got {type(ordernumbers).__name__}')
 
-        isikukood.assertions.assert_constructor_list([ssn])
+    def _construct_all(self) -> List[str]:
+        # The cached tuple is shared, so hand out a copy the caller is free to modify
+        return list(isikukood.functions._all_ssns(self._prefix))
 
-        return ssn
+    def _construct_one(self, ordernumber: int) -> str:
+        isikukood.assertions.assert_ordernumber_range(ordernumber)
 
-    @multimethod
-    def construct(self, ordernumbers: List[int]) -> List[str]:
-        """Generate all possible SSNs with the instance's gender and birthdate
-        and with all the order numbers that were given as an argument.
-
-        Examples:
-        ```python
-            >>>isikukood.Isikukood('m', '2000-01-01').construct([111, 222, 333])
-            ['50001011112', '50001012229', '50001013335']
-        ```
+        ssn = self._gen_ssn(ordernumber)
 
-        Args:
-            ordernumbers (List[int]): List of order numbers.
+        isikukood.assertions.assert_constructor_list([ssn], isikukood.assertions._VALIDATE_CONSTRUCTED)
 
-        Returns:
-            List[str]: List of SSNs.
+        return ssn
 
-        Raises:
-            ValueError: When any of the given order numbers is invalid.
-        """
+    def _construct_many(self, ordernumbers: List[int]) -> List[str]:
+        isikukood.assertions.assert_ordernumber_list(ordernumbers)
 
-        ret = []
-        for onum in ordernumbers:
-            try: isikukood.assertions.assert_ordernumber_range(onum)
-            except AssertionError as e: raise ValueError(e)
-            ret.append(self._gen_ssn(onum))
+        ret = isikukood.functions._gen_ssns(self._prefix, self._prefix_sums, ordernumbers)
 
-        isikukood.assertions.assert_constructor_list(ret)
+        isikukood.assertions.assert_constructor_list(ret, isikukood.assertions._VALIDATE_CONSTRUCTED)
 
         return ret
@@ -1,12 +1,20 @@
 from setuptools import setup
 from codecs import open
-from os import path
+from os import environ, path
 
 HERE = path.abspath(path.dirname(__file__))
 
 with open(path.join(HERE, 'README.md'), encoding='utf-8') as f:
     long_description = f.read()
 
+# Set ISIKUKOOD_USE_MYPYC=1 to compile the hot modules with mypyc. Without it, the pure-Python package is built.
+# The Isikukood class is left interpreted on purpose, since compiling it would forbid subclassing it
+# and setting extra attributes on its instances.
+ext_modules = []
+if environ.get('ISIKUKOOD_USE_MYPYC') == '1':
+    from mypyc.build import mypycify
+    ext_modules = mypycify(['isikukood/functions.py', 'isikukood/assertions.py'])
+
 setup(
     name="isikukood",
     version="1.0.2",
@@ -30,5 +38,5 @@ setup(
     ],
     packages=["isikukood"],
     include_package_data=True,
-    install_requires=["multimethod"]
+    ext_modules=ext_modules
 )
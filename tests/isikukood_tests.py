@@ -1,19 +1,41 @@
+import enum
 import unittest
 
 from isikukood import Isikukood
 import isikukood
 
+# When compiled with mypyc, the int annotations already reject non-int arguments with a TypeError before any of
+# the library's own checks run. The pure-Python package has to raise ValueError.
+COMPILED = not isikukood.functions.__file__.endswith('.py')
+NON_INT_ERROR = (ValueError, TypeError) if COMPILED else ValueError
+
+
+class Year(enum.IntEnum):
+    Y2000 = 2000
+
 
 class AssertionsTestCase(unittest.TestCase):
     def test_assert_ordernumber_range(self):
         self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_ordernumber_range(-1))
         self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_ordernumber_range(1000))
 
+    def test_assert_ordernumber_list(self):
+        try: isikukood.assertions.assert_ordernumber_list([])
+        except Exception as e: self.fail(e)
+
+        try: isikukood.assertions.assert_ordernumber_list([0, 500, 999])
+        except Exception as e: self.fail(e)
+
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_ordernumber_list([0, 1000]))
+        self.assertRaises(NON_INT_ERROR, lambda: isikukood.assertions.assert_ordernumber_list([0, 1.5, 999]))
+
     def test_assert_numeric(self):
         try: isikukood.assertions.assert_numeric('123')
         except Exception as e: self.fail(e)
 
         self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_numeric('x'))
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_numeric(''))
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_numeric('\u0661\u0662\u0663'))
 
     def test_assert_gender(self):
         try: isikukood.assertions.assert_gender('m')
@@ -47,6 +69,10 @@ class AssertionsTestCase(unittest.TestCase):
 
         self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_existing_date('2001-02-29'))
         self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_existing_date('2000-04-31'))
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_existing_date('1900-02-29'))
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_existing_date('2000-13-01'))
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_existing_date('2000-1-01'))
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_existing_date('2000-01-xx'))
 
     def test_assert_constructor_list(self):
         try: isikukood.assertions.assert_constructor_list(['50001010006', '50001010017', '50001010028', '50001010039'])
@@ -55,6 +81,11 @@ class AssertionsTestCase(unittest.TestCase):
         self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_constructor_list(['50001010006', '50001010017', '50001010006', '50001010039']))
         self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_constructor_list(['50001010006', 'x']))
 
+        try: isikukood.assertions.assert_constructor_list(['50001010006', 'x'], validate=False)
+        except Exception as e: self.fail(e)
+
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_constructor_list(['50001010006', '50001010006'], validate=False))
+
     def test_assert_valid_ssn(self):
         self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_valid_ssn('50001x10006'))
         self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_valid_ssn('90001010006'))
@@ -62,12 +93,29 @@ class AssertionsTestCase(unittest.TestCase):
         self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_valid_ssn('50000000000'))
         self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_valid_ssn('50000000005'))
 
+    def test_assert_valid_ssns(self):
+        try: isikukood.assertions.assert_valid_ssns(['50001010006', '38001085718', '60002290003'])
+        except Exception as e: self.fail(e)
+
+        try: isikukood.assertions.assert_valid_ssns(('50001010006',))
+        except Exception as e: self.fail(e)
+
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_valid_ssns(['50001010006', '50001x10006']))
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_valid_ssns(['50001010006', '500010100060']))
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_valid_ssns(['50001010006', '50001010000']))
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_valid_ssns(['50001010006', '50102290005']))
+
     def test_assert_correct_checksum(self):
         try: isikukood.assertions.assert_correct_checksum('50001010006')
         except Exception as e: self.fail(e)
 
         self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_valid_ssn('50001010000'))
 
+    def test_validation_error(self):
+        self.assertRaises(ValueError, lambda: isikukood.assertions.assert_gender('x'))
+        self.assertRaises(AssertionError, lambda: isikukood.assertions.assert_gender('x'))
+        self.assertRaises(isikukood.ValidationError, lambda: isikukood.assertions.assert_valid_ssn('50001010000'))
+
     def test_assert_enum_arguments(self):
         try:
             isikukood.assertions.assert_enum_arguments(['m', 'f'], list(range(1, 31+1)), list(range(1, 12+1)), list(range(1800, 2199+1)))
@@ -105,6 +153,12 @@ class FunctionsTestCase(unittest.TestCase):
         self.assertEqual(isikukood.functions.gender_marker(2000, 'f'), '6')
         self.assertEqual(isikukood.functions.gender_marker(2100, 'm'), '7')
         self.assertEqual(isikukood.functions.gender_marker(2100, 'f'), '8')
+        self.assertEqual(isikukood.functions.gender_marker(Year.Y2000, 'm'), '5')
+
+        self.assertRaises(NON_INT_ERROR, lambda: isikukood.functions.gender_marker(1850.5, 'm'))
+        self.assertRaises(NON_INT_ERROR, lambda: isikukood.functions.gender_marker(1850.0, 'm'))
+        self.assertRaises(ValueError, lambda: isikukood.functions.gender_marker(2200, 'm'))
+        self.assertRaises(ValueError, lambda: isikukood.functions.gender_marker(2000, 'x'))
 
     def test_birthdate_from_ssn(self):
         self.assertEqual(isikukood.functions.birthdate_from_ssn('10001010002'), '1800-01-01')
@@ -117,6 +171,14 @@ class FunctionsTestCase(unittest.TestCase):
         self.assertEqual(isikukood.functions.insert_checksum('5000101000'), '50001010006')
         self.assertRaises(ValueError, lambda: isikukood.functions.insert_checksum('500010100'))
 
+    def test_calculate_checksum(self):
+        self.assertEqual(isikukood.functions.calculate_checksum('5000101000'), 6)
+        self.assertEqual(isikukood.functions.calculate_checksum('50001010006'), 6)
+        self.assertEqual(isikukood.functions.calculate_checksum('3800108007'), 9)
+        self.assertEqual(isikukood.functions.calculate_checksum('5000101000', validate=False), 6)
+        self.assertRaises(ValueError, lambda: isikukood.functions.calculate_checksum('500010100'))
+        self.assertRaises(ValueError, lambda: isikukood.functions.calculate_checksum('500010100x'))
+
     def test_enum(self):
         self.assertEqual(isikukood.functions.enum(genders=[]), [])
         self.assertEqual(isikukood.functions.enum(years=[]), [])
@@ -127,6 +189,15 @@ class FunctionsTestCase(unittest.TestCase):
                          isikukood.functions.enum(genders=['m'], days=[1], months=[6, 4, 5, 3, 2]))
         self.assertEqual(len(isikukood.functions.enum(years=[2000])), 732000)
         self.assertEqual(len(isikukood.functions.enum(years=[2001])), 730000)
+        self.assertEqual(isikukood.functions.enum(genders=['m'], days=[1], months=[1], years=[Year.Y2000], onums=[0]),
+                         ['50001010006'])
+        self.assertRaises(ValueError, lambda: isikukood.functions.enum(onums=[1000]))
+        self.assertRaises(ValueError, lambda: isikukood.functions.enum(onums=[-1, 0]))
+        self.assertRaises(NON_INT_ERROR, lambda: isikukood.functions.enum(onums=[0, 1.5, 999]))
+        self.assertRaises(NON_INT_ERROR, lambda: isikukood.functions.enum(days=['1']))
+        self.assertRaises(NON_INT_ERROR, lambda: isikukood.functions.enum(months=[1.0]))
+        self.assertRaises(NON_INT_ERROR, lambda: isikukood.functions.enum(years=['2000']))
+        self.assertRaises(NON_INT_ERROR, lambda: isikukood.functions.enum(onums=['1']))
 
 
 class IsikukoodTestCase(unittest.TestCase):
@@ -134,12 +205,42 @@ class IsikukoodTestCase(unittest.TestCase):
         try: Isikukood('m', '2000-01-01')
         except ValueError as e: self.fail(e)
         self.assertRaises(ValueError, lambda: Isikukood('m', '2999-01-01'))
+        self.assertRaises(ValueError, lambda: Isikukood('m', '2000-02-30'))
+        self.assertRaises(ValueError, lambda: Isikukood('m', 'x'))
         self.assertRaises(ValueError, lambda: Isikukood.from_ssn('38001085710'))
 
     def test_instantiate_from_ssn(self):
         try: Isikukood.from_ssn('50001010006')
         except ValueError as e: self.fail(e)
         self.assertRaises(ValueError, lambda: Isikukood.from_ssn('50001010000'))
+        self.assertRaises(ValueError, lambda: Isikukood.from_ssn('50102290005'))
+        self.assertRaises(ValueError, lambda: Isikukood.from_ssn('90001010006'))
+        self.assertEqual(Isikukood.from_ssn('38001085718').construct(571), '38001085718')
+
+        class Subclass(Isikukood): pass
+        self.assertIsInstance(Subclass.from_ssn('50001010006'), Subclass)
+
+    def test_setters(self):
+        ik = Isikukood('m', '2000-01-01')
+        ik.gender = 'f'
+        self.assertEqual(ik.construct(0), '60001010007')
+        ik.birthdate = '1999-12-31'
+        self.assertEqual(ik.construct(0), '49912310000')
+        self.assertRaises(ValueError, lambda: setattr(ik, 'gender', 'x'))
+        self.assertEqual(ik.construct(0), '49912310000')
+        self.assertRaises(ValueError, lambda: setattr(ik, 'birthdate', '2200-01-01'))
+        self.assertEqual((ik.gender, ik.birthdate), ('f', '1999-12-31'))
+        self.assertEqual(ik.construct(0), '49912310000')
+
+    def test_construct(self):
+        ssns = Isikukood('m', '2000-01-01').construct()
+        self.assertEqual(len(ssns), 1000)
+        self.assertEqual(ssns[:4], ['50001010006', '50001010017', '50001010028', '50001010039'])
+        self.assertEqual(ssns[999], '50001019993')
+
+        # Modifying the returned list must not affect later calls
+        ssns.clear()
+        self.assertEqual(len(Isikukood('m', '2000-01-01').construct()), 1000)
 
     def test_construct_int(self):
         ik = Isikukood('m', '2000-01-01')
@@ -164,6 +265,11 @@ class IsikukoodTestCase(unittest.TestCase):
         ik = Isikukood('m', '2000-01-01')
         self.assertEqual(ik.construct([0, 1, 2, 3]), ['50001010006', '50001010017', '50001010028', '50001010039'])
 
+        ik = Isikukood('m', '2000-01-01')
+        self.assertRaises(ValueError, lambda: ik.construct([0, 1000]))
+        self.assertRaises(NON_INT_ERROR, lambda: ik.construct([0, 1.5, 2]))
+        self.assertRaises(TypeError, lambda: ik.construct('0'))
+
 
 if __name__ == '__main__':
     unittest.main()